@@ -1,9 +1,25 @@
-from motor.motor_asyncio import AsyncIOMotorDatabase
+import asyncio
+import hashlib
+import logging
+import time
+
+from pymongo.asynchronous.database import AsyncDatabase
 from typing import List, Optional
 from . import models
 from bson import ObjectId
-from bson.errors import InvalidId
 from datetime import datetime, timezone
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# 목록 조회용 TypeAdapter. 모듈 로드 시 한 번만 만들어 두면
+# 문서마다 Model(**doc)을 호출하는 대신 리스트 전체를
+# pydantic-core의 단일 호출로 검증할 수 있습니다.
+_POST_LIST_ADAPTER = TypeAdapter(List[models.PostInDB])
+_RAW_QUESTION_LIST_ADAPTER = TypeAdapter(List[models.RawQuestionInDB])
+_REP_QUESTION_LIST_ADAPTER = TypeAdapter(List[models.RepresentativeQuestionInDB])
 
 # 컬렉션 이름 정의
 COMMUNITY_COLLECTION = "community_posts"
@@ -12,8 +28,36 @@ REPRESENTATIVE_QUESTIONS_COLLECTION = "representative_questions"
 ANSWERS_COLLECTION = "answers"
 LIKES_COLLECTION = "likes"
 
+
+async def ensure_indexes(db: AsyncDatabase):
+    """실제 쿼리 형태(filter + sort)에 맞는 복합 인덱스를 생성합니다.
+
+    인덱스가 없으면 status 필터나 total_votes 정렬이 컬렉션 풀스캔 +
+    메모리 정렬로 처리됩니다. create_index는 이미 존재하면 아무 일도 하지
+    않으므로 서버 시작 시마다 호출해도 안전합니다.
+    """
+    # 대표 질문: status로 필터 + total_votes/_id 내림차순 정렬 (ESR 순서)
+    # title/created_at까지 포함해 목록 쿼리가 응답에 필요한 모든 필드를
+    # 인덱스만으로 읽을 수 있게(covered query) 합니다. 문서 접근이 0이 됩니다.
+    await db[REPRESENTATIVE_QUESTIONS_COLLECTION].create_index(
+        [("status", 1), ("total_votes", -1), ("_id", -1), ("title", 1), ("created_at", 1)]
+    )
+    # Raw 질문: status로 필터하는 파이프라인 조회용
+    await db[RAW_QUESTIONS_COLLECTION].create_index([("status", 1), ("_id", 1)])
+    # Raw 질문: 동일 내용 재제출을 AI 호출 전에 해시 조회 한 번으로 거르기 위한 인덱스
+    await db[RAW_QUESTIONS_COLLECTION].create_index([("content_hash", 1)])
+    # 답변: 대표 질문 ID로 단건 조회 + created_at 내림차순 정렬(목록 API)용
+    await db[ANSWERS_COLLECTION].create_index([("representative_question_id", 1)])
+    await db[ANSWERS_COLLECTION].create_index([("created_at", -1)])
+    # 좋아요: 세션당 대상 하나에 한 번만 누를 수 있도록 유니크 제약을 겁니다.
+    # 중복 확인을 DB 제약으로 내리면 '조회 후 삽입' 대신 '삽입 후 실패 감지'로
+    # 처리할 수 있어 왕복이 줄고 동시 요청 간 경쟁 조건도 사라집니다.
+    await db[LIKES_COLLECTION].create_index(
+        [("session_id", 1), ("target_id", 1), ("target_type", 1)], unique=True
+    )
+
 # --- CREATE (생성) ---
-async def create_post(db: AsyncIOMotorDatabase, post_data: models.PostCreate) -> models.PostInDB:
+async def create_post(db: AsyncDatabase, post_data: models.PostCreate) -> models.PostInDB:
     """새로운 게시글을 데이터베이스에 생성합니다."""
 
     # Pydantic 모델을 딕셔너리로 변환합니다. DB에 저장할 것이므로 mode='python'이 적합합니다.
@@ -24,66 +68,92 @@ async def create_post(db: AsyncIOMotorDatabase, post_data: models.PostCreate) ->
 
     result = await db[COMMUNITY_COLLECTION].insert_one(post_dict)
 
-    created_post = await db[COMMUNITY_COLLECTION].find_one({"_id": result.inserted_id})
+    # 삽입한 데이터는 이미 메모리에 있으므로, 다시 조회하지 않고
+    # inserted_id만 채워서 그대로 반환합니다. (DB 왕복 1회 절약)
+    post_dict["_id"] = result.inserted_id
 
-    return models.PostInDB(**created_post)
+    return models.PostInDB(**post_dict)
 
 # --- READ (읽기) ---
-async def get_all_posts(db: AsyncIOMotorDatabase, skip: int = 0, limit: int = 10) -> List[models.PostInDB]:
-    """모든 게시글을 페이지네이션하여 조회합니다."""
+async def get_all_posts(
+        db: AsyncDatabase, skip: int = 0, limit: int = 10, after_id: Optional[str] = None
+) -> List[models.PostInDB]:
+    """모든 게시글을 페이지네이션하여 조회합니다.
+
+    after_id(직전 페이지 마지막 글의 _id)가 주어지면 skip 대신 범위 조건으로
+    이어서 조회합니다. skip(N)은 서버가 N개의 인덱스 엔트리를 걷어내야 하지만,
+    범위 조건은 인덱스 탐색 한 번으로 시작 지점을 찾습니다.
+    """
 
-    posts = []
     # .sort("_id", -1) -> 최신 글 순서로 정렬 (내림차순)
-    # .skip(skip) -> 특정 개수만큼 건너뛰기 (페이지네이션)
-    # .limit(limit) -> 최대 개수 제한 (페이지네이션)
-    cursor = db[COMMUNITY_COLLECTION].find().sort("_id", -1).skip(skip).limit(limit)
-
-    async for post in cursor:
-        posts.append(models.PostInDB(**post))
+    if after_id and ObjectId.is_valid(after_id):
+        cursor = db[COMMUNITY_COLLECTION].find(
+            {"_id": {"$lt": ObjectId(after_id)}}
+        ).sort("_id", -1).limit(limit)
+    else:
+        # .skip(skip) -> 특정 개수만큼 건너뛰기 (페이지네이션)
+        # .limit(limit) -> 최대 개수 제한 (페이지네이션)
+        cursor = db[COMMUNITY_COLLECTION].find().sort("_id", -1).skip(skip).limit(limit)
 
-    return posts
+    # async for로 문서를 하나씩 받는 대신 to_list로 한 번에 가져옵니다.
+    # (문서마다 이벤트 루프를 오가는 오버헤드 제거)
+    posts = await cursor.to_list(length=limit)
+    return _POST_LIST_ADAPTER.validate_python(posts)
 
 
-async def get_post_by_id(db: AsyncIOMotorDatabase, post_id: str) -> Optional[models.PostInDB]:
+async def get_post_by_id(db: AsyncDatabase, post_id: str) -> Optional[models.PostInDB]:
     """ID로 특정 게시글 하나를 조회합니다."""
-    try:
-        # 이 부분에서 InvalidId 예외가 발생할 수 있습니다.
-        oid = ObjectId(post_id)
-        post = await db[COMMUNITY_COLLECTION].find_one({"_id": oid})
-        if post:
-            return models.PostInDB(**post)
-        return None  # 게시글이 없으면 None을 반환
-    except InvalidId:
-        # ObjectId 형식 자체가 잘못된 경우, 게시글이 없는 것과 동일하게 취급합니다.
+    # try/except로 InvalidId를 잡는 대신 is_valid로 먼저 검사합니다.
+    # 예외를 일으키고 처리하는 비용이 단순 검사보다 훨씬 크기 때문입니다.
+    # ObjectId 형식 자체가 잘못된 경우, 게시글이 없는 것과 동일하게 취급합니다.
+    if not ObjectId.is_valid(post_id):
         return None
 
+    post = await db[COMMUNITY_COLLECTION].find_one({"_id": ObjectId(post_id)})
+    if post:
+        return models.PostInDB(**post)
+    return None  # 게시글이 없으면 None을 반환
+
 
 # ---UPDATE (수정)---
-async def update_post(db: AsyncIOMotorDatabase, post_id: str, post_data: models.PostUpdate) -> Optional[models.PostInDB]:
+async def update_post(db: AsyncDatabase, post_id: str, post_data: models.PostUpdate) -> Optional[models.PostInDB]:
     """ID로 특정 게시글을 수정합니다."""
 
+    # 잘못된 ID 형식은 게시글이 없는 것과 동일하게 취급합니다.
+    if not ObjectId.is_valid(post_id):
+        return None
+
     # model_dump(exclude_unset=True) 옵션을 사용하면,
     # 사용자가 명시적으로 설정하지 않은 필드(기본값=None)를 알아서 제외해 줍니다.
     # 이전의 복잡한 딕셔너리 컴프리헨션보다 훨씬 깔끔하고 의도가 명확합니다.
     update_data = post_data.model_dump(exclude_unset=True)
 
-    if len(update_data) >= 1:
-        # $set 연산자를 사용하여 지정된 필드만 업데이트합니다.
-        await db[COMMUNITY_COLLECTION].update_one(
-            {"_id": ObjectId(post_id)},
-            {"$set": update_data}
-        )
+    # 수정할 필드가 없으면 업데이트를 생략하고 현재 문서만 조회합니다.
+    if not update_data:
+        return await get_post_by_id(db, post_id)
+
+    # find_one_and_update는 수정과 조회를 한 번의 명령으로 처리하므로,
+    # update_one 후 다시 find_one 하는 것보다 DB 왕복이 1회 줄어듭니다.
+    updated_post = await db[COMMUNITY_COLLECTION].find_one_and_update(
+        {"_id": ObjectId(post_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
+    )
 
-    # 수정된 최신 문서를 다시 찾아서 반환합니다.
     # 'None'을 반환할 수 있으므로, 라우터에서 예외 처리를 해야 합니다.
-    updated_post = await get_post_by_id(db, post_id)
-    return updated_post
+    if updated_post:
+        return models.PostInDB(**updated_post)
+    return None
 
 
 # DELETE 삭제
-async def delete_post(db: AsyncIOMotorDatabase, post_id: str) -> bool:
+async def delete_post(db: AsyncDatabase, post_id: str) -> bool:
     """ID로 특정 게시글을 삭제합니다."""
 
+    # 잘못된 ID 형식은 삭제 실패와 동일하게 취급합니다.
+    if not ObjectId.is_valid(post_id):
+        return False
+
     result = await db[COMMUNITY_COLLECTION].delete_one({"_id": ObjectId(post_id)})
 
     # result.deleted_count가 1이면 성공적으로 삭제된 것입니다.
@@ -96,24 +166,108 @@ async def delete_post(db: AsyncIOMotorDatabase, post_id: str) -> bool:
 # RawQuestion CRUD 함수
 # --------------------------------------------------------------------------
 
-async def create_raw_question(db: AsyncIOMotorDatabase,
+def raw_question_content_hash(content: str) -> str:
+    """Raw 질문 내용의 중복 판별용 SHA1 해시를 계산합니다."""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+async def get_raw_question_by_content_hash(
+        db: AsyncDatabase, content_hash: str
+) -> Optional[models.RawQuestionInDB]:
+    """동일한 content_hash를 가진 기존 Raw 질문을 조회합니다. (인덱스 조회 1회)"""
+    question = await db[RAW_QUESTIONS_COLLECTION].find_one({"content_hash": content_hash})
+    if question:
+        return models.RawQuestionInDB(**question)
+    return None
+
+
+async def get_representative_question_for_raw(
+        db: AsyncDatabase, raw_question_id: models.PyObjectId
+) -> Optional[models.RepresentativeQuestionInDB]:
+    """특정 Raw 질문이 종합되어 들어간 대표 질문을 조회합니다."""
+    question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one(
+        {"raw_question_ids": raw_question_id}
+    )
+    if question:
+        return models.RepresentativeQuestionInDB(**question)
+    return None
+
+
+async def insert_prepared_raw_question(db: AsyncDatabase,
+                                       question: models.RawQuestionInDB) -> None:
+    """_id가 미리 채워진 Raw 질문 문서를 삽입합니다. (백그라운드 태스크용)
+
+    응답은 이미 나간 뒤라 예외를 올려도 받을 곳이 없으므로,
+    실패는 로그로만 남깁니다.
+    """
+    question_dict = question.model_dump(by_alias=True)
+    if not question_dict.get("content_hash"):
+        question_dict["content_hash"] = raw_question_content_hash(question.content)
+    try:
+        await db[RAW_QUESTIONS_COLLECTION].insert_one(question_dict)
+    except Exception:
+        logger.exception("백그라운드 Raw 질문 삽입 실패 - _id: %s", question.id)
+
+
+async def create_raw_question(db: AsyncDatabase,
                               question_data: models.RawQuestionCreate) -> models.RawQuestionInDB:
     """새로운 Raw 질문을 데이터베이스에 생성합니다."""
     question_dict = question_data.model_dump()
+    # 중복 제출 판별용 해시를 서버에서 채웁니다.
+    if not question_dict.get("content_hash"):
+        question_dict["content_hash"] = raw_question_content_hash(question_data.content)
     result = await db[RAW_QUESTIONS_COLLECTION].insert_one(question_dict)
-    created_question = await db[RAW_QUESTIONS_COLLECTION].find_one({"_id": result.inserted_id})
-    return models.RawQuestionInDB(**created_question)
+    # 재조회 없이 inserted_id만 채워서 반환합니다. (DB 왕복 1회 절약)
+    question_dict["_id"] = result.inserted_id
+    return models.RawQuestionInDB(**question_dict)
 
 
 async def get_raw_questions_by_status(
-    db: AsyncIOMotorDatabase, status: models.RawQuestionStatus, limit: int = 100
+    db: AsyncDatabase, status: models.RawQuestionStatus, limit: int = 100
 ) -> List[models.RawQuestionInDB]:
     """특정 상태의 Raw 질문들을 조회합니다."""
-    questions = []
-    cursor = db[RAW_QUESTIONS_COLLECTION].find({"status": status.value}).limit(limit)
-    async for question in cursor:
-        questions.append(models.RawQuestionInDB(**question))
-    return questions
+    # batch_size를 지정하면 큰 limit에서도 서버가 적당한 크기로 나눠 보내
+    # 한 번의 BSON 디코드가 이벤트 루프를 오래 붙잡지 않습니다.
+    cursor = db[RAW_QUESTIONS_COLLECTION].find({"status": status.value}).batch_size(200).limit(limit)
+    questions = await cursor.to_list(length=limit)
+    return _RAW_QUESTION_LIST_ADAPTER.validate_python(questions)
+
+
+# get_all_answered_questions 파이프라인의 고정 단계들.
+# skip/limit을 제외하면 요청마다 달라지지 않으므로 모듈 로드 시 한 번만 만듭니다.
+_ANSWERED_SORT_STAGE = {"$sort": {"created_at": -1}}
+_ANSWERED_LOOKUP_STAGE = {
+    "$lookup": {
+        "from": REPRESENTATIVE_QUESTIONS_COLLECTION,  # JOIN할 다른 컬렉션
+        "localField": "representative_question_id",  # 현재(answers) 컬렉션의 필드
+        "foreignField": "_id",  # JOIN할 컬렉션의 필드
+        "as": "question_details"  # JOIN된 결과를 담을 필드 이름
+    }
+}
+_ANSWERED_UNWIND_STAGE = {"$unwind": "$question_details"}
+# 응답으로 나갈 최종 형태를 서버에서 전부 만들어 둡니다.
+# ObjectId는 $toString으로 미리 문자열화해서, 결과 dict를 Pydantic 검증 없이
+# 바로 orjson으로 직렬화할 수 있게 합니다. (QuestionAndAnswer 응답 형태와 동일)
+_ANSWERED_PROJECT_STAGE = {
+    "$project": {
+        "_id": 0,  # 최상위 _id는 필요 없으므로 제외
+        "question": {
+            "_id": {"$toString": "$question_details._id"},
+            "title": "$question_details.title",
+            "total_votes": "$question_details.total_votes",
+            "status": "$question_details.status",
+            "created_at": "$question_details.created_at",
+        },
+        "answer": {
+            "_id": {"$toString": "$_id"},
+            "content": "$content",
+            "author_id": "$author_id",
+            "representative_question_id": {"$toString": "$representative_question_id"},
+            "total_votes": "$total_votes",
+            "created_at": "$created_at",
+        }
+    }
+}
 
 
 # --------------------------------------------------------------------------
@@ -121,7 +275,7 @@ async def get_raw_questions_by_status(
 # --------------------------------------------------------------------------
 
 async def save_representative_questions_and_update_raw_status(
-        db: AsyncIOMotorDatabase,
+        db: AsyncDatabase,
         representative_questions_data: List[dict],  # AI가 생성한 JSON 데이터 리스트
         processed_raw_questions: List[models.RawQuestionInDB]  # 처리에 사용된 원본 질문 리스트
 ):
@@ -129,9 +283,8 @@ async def save_representative_questions_and_update_raw_status(
     AI가 생성한 대표 질문들을 저장하고,
     관련된 Raw 질문들의 상태를 'processed'로 업데이트합니다.
     """
-    print(f"[DEBUG] 저장하려는 대표 질문 데이터: {representative_questions_data}")
-    print(f"[DEBUG] 처리된 Raw 질문들: {[q.model_dump() for q in processed_raw_questions]}")
-    
+    logger.debug("저장하려는 대표 질문 수: %d", len(representative_questions_data))
+
     if not representative_questions_data:
         return
 
@@ -149,7 +302,7 @@ async def save_representative_questions_and_update_raw_status(
             try:
                 related_raw_ids.append(ObjectId(id_str))
             except Exception as e:
-                print(f"[WARNING] 유효하지 않은 ObjectId: {id_str}, 에러: {e}")
+                logger.warning("유효하지 않은 ObjectId: %s, 에러: %s", id_str, e)
                 continue
 
         new_rep_question = models.RepresentativeQuestionInDB(
@@ -157,78 +310,138 @@ async def save_representative_questions_and_update_raw_status(
             raw_question_ids=related_raw_ids,  # 이제 ObjectId 배열
         )
         
-        # Pydantic 모델을 dict로 변환하되, _id 필드는 ObjectId로 유지
+        # Pydantic 모델을 dict로 변환하되, ID 필드들은 ObjectId로 유지해야 합니다.
+        # (PyObjectId 직렬화기가 when_used='json'이라 Python 모드 덤프에서는
+        # ObjectId가 유지되지만, 과거 데이터 호환을 위해 방어 코드를 남겨 둡니다.)
         question_dict = new_rep_question.model_dump(by_alias=True)
         # _id 필드가 문자열로 변환되었다면 다시 ObjectId로 변환
         if isinstance(question_dict.get("_id"), str):
             question_dict["_id"] = ObjectId(question_dict["_id"])
-        
-        new_rep_questions_to_insert.append(question_dict)
+        # raw_question_ids도 위에서 만든 ObjectId 리스트로 항상 덮어씁니다.
+        question_dict["raw_question_ids"] = related_raw_ids
 
-    if new_rep_questions_to_insert:
-        await db[REPRESENTATIVE_QUESTIONS_COLLECTION].insert_many(new_rep_questions_to_insert)
-        print(f"{len(new_rep_questions_to_insert)}개의 대표 질문이 저장되었습니다.")
+        new_rep_questions_to_insert.append(question_dict)
 
     # 2. 처리가 완료된 Raw 질문들의 ID 목록을 만듭니다.
     processed_raw_ids = [q.id for q in processed_raw_questions]
 
-    # 3. 해당 Raw 질문들의 status를 'represented'로 일괄 업데이트합니다.
+    # 3. 대표 질문 저장과 Raw 질문 상태 업데이트는 서로 다른 컬렉션을 대상으로 하는
+    #    독립적인 쓰기이므로, gather로 동시에 보내 왕복을 겹칩니다.
+    #    insert_many는 각 문서가 독립적이라 ordered=False로 병렬 커밋을 허용하고,
+    #    하나가 실패해도 나머지 문서는 그대로 저장됩니다.
+    writes = []
+    if new_rep_questions_to_insert:
+        writes.append(db[REPRESENTATIVE_QUESTIONS_COLLECTION].insert_many(
+            new_rep_questions_to_insert, ordered=False
+        ))
     if processed_raw_ids:
-        await db[RAW_QUESTIONS_COLLECTION].update_many(
+        writes.append(db[RAW_QUESTIONS_COLLECTION].update_many(
             {"_id": {"$in": processed_raw_ids}},
             {"$set": {"status": models.RawQuestionStatus.REPRESENTED.value}}
+        ))
+    if writes:
+        await asyncio.gather(*writes)
+        logger.info(
+            "대표 질문 %d건 저장, Raw 질문 %d건 'represented' 처리 완료",
+            len(new_rep_questions_to_insert), len(processed_raw_ids)
         )
-        print(f"{len(processed_raw_ids)}개의 Raw 질문 상태가 'represented'로 업데이트되었습니다.")
+
+    # 새 대표 질문이 생겼으므로 유사도 검사 캐시를 무효화합니다.
+    if new_rep_questions_to_insert:
+        _invalidate_similarity_cache()
 
 
 # --------------------------------------------------------------------------
 # RepresentativeQuestion CRUD 함수 (API 호출용)
 # --------------------------------------------------------------------------
 
-async def get_all_representative_questions(db: AsyncIOMotorDatabase, skip: int = 0, limit: int = 10) -> List[
-    models.RepresentativeQuestionInDB]:
+async def get_all_representative_questions(
+        db: AsyncDatabase,
+        skip: int = 0,
+        limit: int = 10,
+        after_votes: Optional[int] = None,
+        after_id: Optional[str] = None,
+) -> List[models.RepresentativeQuestionInDB]:
     """
     모든 대표 질문을 'total_votes'가 높은 순서대로 페이지네이션하여 조회합니다.
     사용자에게 보여주기 위한 API에서 사용됩니다.
+
+    after_votes/after_id(직전 페이지 마지막 질문의 공감 수와 _id)가 주어지면
+    skip 대신 복합 범위 조건으로 이어서 조회합니다. (skip의 선형 비용 제거)
     """
-    print(f"[DEBUG] DB 이름: {db.name}")
-    print(f"[DEBUG] 컬렉션 이름: {REPRESENTATIVE_QUESTIONS_COLLECTION}")
-    
-    # 컬렉션의 총 문서 수 확인
-    total_count = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].count_documents({})
-    print(f"[DEBUG] 컬렉션 총 문서 수: {total_count}")
-    
-    questions = []
     # find({"status": "unanswered"}) -> 아직 답변이 달리지 않은 질문만 필터링
     # sort("total_votes", -1) -> 공감 수가 높은 순서대로 정렬 (내림차순)
-    cursor = db[REPRESENTATIVE_QUESTIONS_COLLECTION].find(
-        {"status": "unanswered"}
-    ).sort("total_votes", -1).skip(skip).limit(limit)
+    query = {"status": "unanswered"}
+
+    # 포함(projection) 방식이어야 인덱스만으로 응답하는 covered query가 됩니다.
+    # (제외 방식 projection은 문서 접근을 피할 수 없습니다)
+    list_projection = {"title": 1, "total_votes": 1, "status": 1, "created_at": 1}
+
+    if after_votes is not None and after_id and ObjectId.is_valid(after_id):
+        # (total_votes, _id) 복합 커서: 같은 공감 수 안에서는 _id 내림차순으로 이어갑니다.
+        query["$or"] = [
+            {"total_votes": {"$lt": after_votes}},
+            {"total_votes": after_votes, "_id": {"$lt": ObjectId(after_id)}},
+        ]
+        cursor = db[REPRESENTATIVE_QUESTIONS_COLLECTION].find(
+            query, projection=list_projection
+        ).sort([("total_votes", -1), ("_id", -1)]).limit(limit)
+    else:
+        cursor = db[REPRESENTATIVE_QUESTIONS_COLLECTION].find(
+            query, projection=list_projection
+        ).sort([("total_votes", -1), ("_id", -1)]).skip(skip).limit(limit)
 
-    async for question in cursor:
-        print(f"[DEBUG] 찾은 질문: {question}")
-        questions.append(models.RepresentativeQuestionInDB(**question))
+    questions = await cursor.to_list(length=limit)
+    logger.debug("대표 질문 %d건 조회", len(questions))
+    return _REP_QUESTION_LIST_ADAPTER.validate_python(questions)
 
-    print(f"[DEBUG] 반환할 질문 수: {len(questions)}")
-    return questions
 
+# 유사도 검사용 대표 질문 목록의 프로세스 내 캐시입니다.
+# /questions/raw 제출마다 같은 목록을 DB에서 다시 읽지 않도록 TTL 동안 재사용하고,
+# AI 파이프라인이 새 대표 질문을 저장하면 즉시 무효화합니다.
+# (이 스택에는 Redis가 없으므로 모듈 레벨 캐시로 충분합니다. 단일 프로세스 배포 기준)
+_SIMILARITY_CACHE_TTL_SECONDS = 60.0
+_similarity_cache = {"expires_at": 0.0, "limit": 0, "questions": None}
 
-async def get_all_rep_questions_for_similarity_check(db: AsyncIOMotorDatabase, limit: int = 200) -> List[models.RepresentativeQuestionInDB]:
+
+def _invalidate_similarity_cache():
+    """대표 질문이 새로 저장되면 유사도 검사 캐시를 비웁니다."""
+    _similarity_cache["expires_at"] = 0.0
+    _similarity_cache["questions"] = None
+
+
+async def get_all_rep_questions_for_similarity_check(db: AsyncDatabase, limit: int = 200) -> List[models.RepresentativeQuestionInDB]:
     """
     유사도 검사를 위해, status와 상관없이 모든 대표 질문을 최신순으로 가져옵니다.
     (AI 파이프라인의 부하를 줄이기 위해 최신 200개 등으로 제한하는 것이 좋습니다.)
+    결과는 짧은 TTL 동안 캐시되어 제출이 몰려도 DB 왕복은 TTL당 한 번입니다.
+
+    주의: 프롬프트 구성에 쓰이는 _id와 title만 projection으로 가져옵니다.
+    나머지 필드는 모델 기본값이므로, 매칭된 질문의 전체 문서가 필요하면
+    get_representative_question_by_id로 한 번만 다시 조회하세요.
     """
-    questions = []
-    cursor = db[REPRESENTATIVE_QUESTIONS_COLLECTION].find().sort("_id", -1).limit(limit)
-    async for question in cursor:
-        questions.append(models.RepresentativeQuestionInDB(**question))
-    return questions
+    if (_similarity_cache["questions"] is not None
+            and _similarity_cache["limit"] == limit
+            and time.monotonic() < _similarity_cache["expires_at"]):
+        return _similarity_cache["questions"]
+
+    # 100건 기준 전체 문서 대비 전송 바이트와 검증 비용이 크게 줄어듭니다.
+    cursor = db[REPRESENTATIVE_QUESTIONS_COLLECTION].find(
+        projection={"_id": 1, "title": 1}
+    ).sort("_id", -1).limit(limit)
+    questions = await cursor.to_list(length=limit)
+    validated = _REP_QUESTION_LIST_ADAPTER.validate_python(questions)
+
+    _similarity_cache["questions"] = validated
+    _similarity_cache["limit"] = limit
+    _similarity_cache["expires_at"] = time.monotonic() + _SIMILARITY_CACHE_TTL_SECONDS
+    return validated
 
 # --------------------------------------------------------------------------
 # Answer CRUD 함수
 # --------------------------------------------------------------------------
 
-async def create_answer_for_question(db: AsyncIOMotorDatabase, answer_data: models.AnswerCreate) -> models.AnswerInDB:
+async def create_answer_for_question(db: AsyncDatabase, answer_data: models.AnswerCreate) -> models.AnswerInDB:
     """대표 질문에 대한 새로운 답변을 생성합니다."""
 
     # 1. 답변(Answer) 문서를 생성합니다.
@@ -239,358 +452,258 @@ async def create_answer_for_question(db: AsyncIOMotorDatabase, answer_data: mode
     if isinstance(answer_dict['representative_question_id'], str):
         answer_dict['representative_question_id'] = ObjectId(answer_dict['representative_question_id'])
     
-    result = await db[ANSWERS_COLLECTION].insert_one(answer_dict)
-
-    # 2. 관련 대표 질문(RepresentativeQuestion)의 상태를 'answered'로 업데이트합니다.
-    update_result = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].update_one(
-        {"_id": answer_data.representative_question_id},
-        {"$set": {"status": "answered"}}
+    # 2. 답변 삽입과 대표 질문 상태 변경은 서로 의존성이 없으므로,
+    #    asyncio.gather로 동시에 실행해 왕복 시간을 겹칩니다.
+    #    (순차 실행 시 RTT 합산 → 동시 실행 시 max(RTT))
+    result, rep_question = await asyncio.gather(
+        db[ANSWERS_COLLECTION].insert_one(answer_dict),
+        db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one_and_update(
+            {"_id": answer_data.representative_question_id},
+            {"$set": {"status": "answered"}},
+            projection={"raw_question_ids": 1},
+            return_document=ReturnDocument.AFTER
+        )
     )
-    print(f"[DEBUG] 대표 질문 상태 업데이트 결과: {update_result.modified_count}개 문서 수정됨")
 
-    # 3. 대표 질문에 묶인 모든 Raw 질문들의 상태를 'answered'로 업데이트합니다.
-    rep_question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one(
-        {"_id": answer_data.representative_question_id}
-    )
-    print(f"[DEBUG] 조회된 대표 질문: {rep_question}")
-    
+    # 3. 대표 질문에 묶인 모든 Raw 질문들의 상태를 'answered'로 일괄 업데이트합니다.
     if rep_question and rep_question.get("raw_question_ids"):
-        raw_ids_to_update = rep_question["raw_question_ids"]
-        print(f"[DEBUG] 업데이트할 Raw 질문 ID들: {raw_ids_to_update}")
-        print(f"[DEBUG] Raw ID들의 타입: {[type(rid) for rid in raw_ids_to_update]}")
-        
-        # Raw 질문들이 실제로 존재하는지 먼저 확인
-        existing_raw_questions = await db[RAW_QUESTIONS_COLLECTION].find(
-            {"_id": {"$in": raw_ids_to_update}}
-        ).to_list(length=None)
-        print(f"[DEBUG] ObjectId로 찾은 Raw 질문 수: {len(existing_raw_questions)}")
-        
-        # ObjectId로 찾은 결과가 없다면 문자열을 ObjectId로 변환해서 시도
-        if len(existing_raw_questions) == 0:
-            raw_ids_as_str = [str(rid) for rid in raw_ids_to_update]
-            print(f"[DEBUG] 문자열로 변환된 ID들: {raw_ids_as_str}")
-            existing_raw_questions = await db[RAW_QUESTIONS_COLLECTION].find(
-                {"_id": {"$in": raw_ids_as_str}}
-            ).to_list(length=None)
-            print(f"[DEBUG] 문자열로 찾은 Raw 질문 수: {len(existing_raw_questions)}")
-            
-            # 문자열로도 찾을 수 없다면 문자열을 ObjectId로 변환해서 시도
-            if len(existing_raw_questions) == 0:
-                try:
-                    raw_ids_as_objectid = [ObjectId(rid) for rid in raw_ids_as_str]
-                    print(f"[DEBUG] ObjectId로 변환된 ID들: {raw_ids_as_objectid}")
-                    existing_raw_questions = await db[RAW_QUESTIONS_COLLECTION].find(
-                        {"_id": {"$in": raw_ids_as_objectid}}
-                    ).to_list(length=None)
-                    print(f"[DEBUG] ObjectId로 변환 후 찾은 Raw 질문 수: {len(existing_raw_questions)}")
-                    
-                    if len(existing_raw_questions) > 0:
-                        # ObjectId로 업데이트 시도
-                        raw_update_result = await db[RAW_QUESTIONS_COLLECTION].update_many(
-                            {"_id": {"$in": raw_ids_as_objectid}},
-                            {"$set": {"status": models.RawQuestionStatus.ANSWERED.value}}
-                        )
-                    else:
-                        raw_update_result = await db[RAW_QUESTIONS_COLLECTION].update_many(
-                            {"_id": {"$in": raw_ids_as_str}},
-                            {"$set": {"status": models.RawQuestionStatus.ANSWERED.value}}
-                        )
-                except Exception as e:
-                    print(f"[DEBUG] ObjectId 변환 실패: {e}")
-                    # 문자열로 업데이트 시도
-                    raw_update_result = await db[RAW_QUESTIONS_COLLECTION].update_many(
-                        {"_id": {"$in": raw_ids_as_str}},
-                        {"$set": {"status": models.RawQuestionStatus.ANSWERED.value}}
-                    )
-            else:
-                # 문자열로 업데이트 시도
-                raw_update_result = await db[RAW_QUESTIONS_COLLECTION].update_many(
-                    {"_id": {"$in": raw_ids_as_str}},
-                    {"$set": {"status": models.RawQuestionStatus.ANSWERED.value}}
-                )
-        else:
-            # ObjectId로 업데이트 시도
-            raw_update_result = await db[RAW_QUESTIONS_COLLECTION].update_many(
-                {"_id": {"$in": raw_ids_to_update}},
-                {"$set": {"status": models.RawQuestionStatus.ANSWERED.value}}
-            )
-        
-        print(f"[DEBUG] Raw 질문 상태 업데이트 결과: {raw_update_result.modified_count}개 문서 수정됨")
-    else:
-        print("[DEBUG] raw_question_ids가 없거나 대표 질문을 찾을 수 없습니다.")
+        # 과거 데이터에 문자열로 저장된 ID가 섞여 있을 수 있으므로 한 번만 정규화합니다.
+        raw_ids = [
+            rid if isinstance(rid, ObjectId) else ObjectId(rid)
+            for rid in rep_question["raw_question_ids"]
+        ]
+        await db[RAW_QUESTIONS_COLLECTION].update_many(
+            {"_id": {"$in": raw_ids}},
+            {"$set": {"status": models.RawQuestionStatus.ANSWERED.value}}
+        )
 
-    # 4. 생성된 답변 문서를 다시 조회하여 반환합니다.
-    created_answer = await db[ANSWERS_COLLECTION].find_one({"_id": result.inserted_id})
-    return models.AnswerInDB(**created_answer)
+    # 4. 생성된 답변 문서를 재조회하지 않고, inserted_id만 채워서 반환합니다.
+    answer_dict["_id"] = result.inserted_id
+    return models.AnswerInDB(**answer_dict)
 
 
-async def get_answer_for_question(db: AsyncIOMotorDatabase, question_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
+async def get_answer_for_question(db: AsyncDatabase, question_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
     """특정 대표 질문에 달린 답변을 조회합니다."""
     answer = await db[ANSWERS_COLLECTION].find_one({"representative_question_id": question_id})
     if answer:
         return models.AnswerInDB(**answer)
     return None
 
-async def get_representative_question_by_id(db: AsyncIOMotorDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
+async def get_representative_question_by_id(db: AsyncDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
     """ID로 특정 대표 질문 하나를 조회합니다."""
-    print(f"[DEBUG] 조회하려는 대표 질문 ID: {question_id}, 타입: {type(question_id)}")
     question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one({"_id": question_id})
-    print(f"[DEBUG] DB 조회 결과: {question}")
     if question:
         return models.RepresentativeQuestionInDB(**question)
     return None
 
 
-async def get_all_answered_questions(db: AsyncIOMotorDatabase, skip: int = 0, limit: int = 10) -> List[dict]:
+async def get_all_answered_questions(
+        db: AsyncDatabase,
+        skip: int = 0,
+        limit: int = 10,
+        after_created_at: Optional[datetime] = None,
+) -> List[dict]:
     """
     답변이 완료된 모든 질문과 답변 쌍을 최신순으로 조회합니다.
     MongoDB Aggregation Pipeline을 사용합니다.
+
+    after_created_at(직전 페이지 마지막 답변의 생성 시각)이 주어지면
+    $skip 대신 범위 $match로 이어서 조회합니다. (skip의 선형 비용 제거)
     """
-    print(f"[DEBUG] get_all_answered_questions 호출됨 - skip: {skip}, limit: {limit}")
-    
-    # 먼저 답변 컬렉션에 데이터가 있는지 확인
-    answer_count = await db[ANSWERS_COLLECTION].count_documents({})
-    print(f"[DEBUG] 전체 답변 수: {answer_count}")
-    
-    # 실제 답변 데이터 확인
-    sample_answer = await db[ANSWERS_COLLECTION].find_one()
-    print(f"[DEBUG] 샘플 답변 데이터: {sample_answer}")
-    
-    # 대표 질문 데이터 확인
-    rep_question_count = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].count_documents({})
-    print(f"[DEBUG] 전체 대표 질문 수: {rep_question_count}")
-    
-    sample_rep_question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one()
-    print(f"[DEBUG] 샘플 대표 질문 데이터: {sample_rep_question}")
-    
-    # 답변의 representative_question_id로 직접 대표 질문을 찾아보기
-    if sample_answer:
-        direct_match = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one(
-            {"_id": sample_answer["representative_question_id"]}
-        )
-        print(f"[DEBUG] 직접 매칭 결과: {direct_match}")
-        
-        # 문자열로 변환해서도 찾아보기
-        str_id = str(sample_answer["representative_question_id"])
-        string_match = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one(
-            {"_id": str_id}
-        )
-        print(f"[DEBUG] 문자열 매칭 결과: {string_match}")
-    
+    # skip/limit을 제외한 단계는 모듈 상수(_ANSWERED_* )로 미리 만들어 두었으므로,
+    # 요청마다 새로 만드는 dict는 페이지네이션 두 개뿐입니다.
     pipeline = [
         # 1. 답변(answers)을 최신 생성 순서로 정렬합니다.
-        {"$sort": {"created_at": -1}},
+        _ANSWERED_SORT_STAGE,
 
-        # 2. representative_questions 컬렉션과 JOIN 합니다. ($lookup)
-        {
-            "$lookup": {
-                "from": REPRESENTATIVE_QUESTIONS_COLLECTION,  # JOIN할 다른 컬렉션
-                "localField": "representative_question_id",  # 현재(answers) 컬렉션의 필드
-                "foreignField": "_id",  # JOIN할 컬렉션의 필드
-                "as": "question_details"  # JOIN된 결과를 담을 필드 이름
-            }
-        },
+        # 2. 페이지네이션을 $lookup보다 먼저 적용합니다.
+        #    정렬/페이지네이션은 answers 필드만 참조하므로 순서를 바꿔도 결과는 같고,
+        #    JOIN은 전체 답변이 아니라 이번 페이지의 limit개에 대해서만 실행됩니다.
+        {"$match": {"created_at": {"$lt": after_created_at}}} if after_created_at
+        else {"$skip": skip},
+        {"$limit": limit},
 
-        # 3. JOIN 결과는 배열([..])이므로, 배열을 풀어 객체로 만듭니다. ($unwind)
-        {"$unwind": "$question_details"},
+        # 3. representative_questions 컬렉션과 JOIN 합니다. ($lookup)
+        _ANSWERED_LOOKUP_STAGE,
 
-        # 4. 페이지네이션을 적용합니다.
-        {"$skip": skip},
-        {"$limit": limit},
+        # 4. JOIN 결과는 배열([..])이므로, 배열을 풀어 객체로 만듭니다. ($unwind)
+        _ANSWERED_UNWIND_STAGE,
 
         # 5. 최종 출력 형태를 우리가 만든 QuestionAndAnswer 모델과 유사하게 재구성합니다.
-        {
-            "$project": {
-                "_id": 0,  # 최상위 _id는 필요 없으므로 제외
-                "question": "$question_details",
-                "answer": {
-                    "_id": "$_id",
-                    "content": "$content",
-                    "author_id": "$author_id",
-                    "representative_question_id": "$representative_question_id",
-                    "created_at": "$created_at"
-                }
-            }
-        }
+        _ANSWERED_PROJECT_STAGE,
     ]
 
-    print(f"[DEBUG] Aggregation pipeline: {pipeline}")
-
     # answers 컬렉션에 대해 aggregation pipeline을 실행합니다.
-    cursor = db[ANSWERS_COLLECTION].aggregate(pipeline)
+    # (PyMongo 비동기 드라이버에서는 aggregate 자체가 코루틴입니다.)
+    cursor = await db[ANSWERS_COLLECTION].aggregate(pipeline)
 
     # 결과를 리스트로 변환하여 반환합니다.
     results = await cursor.to_list(length=limit)
-    print(f"[DEBUG] Aggregation 결과 수: {len(results)}")
-    for i, result in enumerate(results):
-        print(f"[DEBUG] 결과 {i}: {result}")
-    
+    logger.debug("답변 완료 질문 %d건 조회", len(results))
     return results
 
 
 # --- 좋아요 관련 함수들 ---
-async def get_representative_question_by_id(db: AsyncIOMotorDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
-    """ID로 특정 대표 질문 하나를 조회합니다."""
-    question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one({"_id": question_id})
-    if question:
-        return models.RepresentativeQuestionInDB(**question)
-    return None
-
-
-async def increment_representative_question_votes(db: AsyncIOMotorDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
+async def increment_representative_question_votes(db: AsyncDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
     """대표 질문의 좋아요 수를 1 증가시킵니다."""
-    result = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].update_one(
+    # find_one_and_update로 증가와 조회를 한 번의 왕복으로 처리합니다.
+    question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one_and_update(
         {"_id": question_id},
-        {"$inc": {"total_votes": 1}}
+        {"$inc": {"total_votes": 1}},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.modified_count > 0:
-        # 업데이트된 질문을 다시 조회하여 반환
-        return await get_representative_question_by_id(db, question_id)
+
+    if question:
+        return models.RepresentativeQuestionInDB(**question)
     return None
 
 
-async def decrement_representative_question_votes(db: AsyncIOMotorDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
+async def decrement_representative_question_votes(db: AsyncDatabase, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
     """대표 질문의 좋아요 수를 1 감소시킵니다. (최소값은 0)"""
-    result = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].update_one(
+    question = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].find_one_and_update(
         {"_id": question_id, "total_votes": {"$gt": 0}},  # total_votes가 0보다 클 때만 감소
-        {"$inc": {"total_votes": -1}}
+        {"$inc": {"total_votes": -1}},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.modified_count > 0:
-        # 업데이트된 질문을 다시 조회하여 반환
-        return await get_representative_question_by_id(db, question_id)
+
+    if question:
+        return models.RepresentativeQuestionInDB(**question)
     return None
 
 
 # --- Like 관련 함수들 (쿠키/세션 기반) ---
-async def check_user_already_liked(db: AsyncIOMotorDatabase, session_id: str, target_id: models.PyObjectId, target_type: str) -> bool:
+def _as_oid(value) -> ObjectId:
+    """이미 ObjectId면 그대로 돌려주고, 아니면 변환합니다.
+
+    PyObjectId는 ObjectId의 서브클래스라 ObjectId(str(x)) 왕복(hex 인코딩/디코딩)이
+    불필요한데, 좋아요 한 번에 같은 변환이 여러 함수에서 반복되므로 한 곳에 모았습니다.
+    """
+    return value if isinstance(value, ObjectId) else ObjectId(value)
+
+
+async def check_user_already_liked(db: AsyncDatabase, session_id: str, target_id: models.PyObjectId, target_type: str) -> bool:
     """사용자가 이미 해당 대상(질문 또는 답변)에 좋아요를 눌렀는지 확인합니다."""
-    print(f"[DEBUG CRUD] 중복 체크 - session_id: {session_id}, target_id: {target_id}, target_type: {target_type}")
-    print(f"[DEBUG CRUD] target_id 타입: {type(target_id)}")
-    print(f"[DEBUG CRUD] target_id 값: {target_id}")
-    
-    # ObjectId와 문자열 둘 다 시도해보자
-    from bson import ObjectId
-    
-    # 1. 원래 값으로 검색
-    existing_like = await db[LIKES_COLLECTION].find_one({
-        "session_id": session_id,
-        "target_id": target_id,
-        "target_type": target_type
-    })
-    
-    # 2. 문자열로 변환해서 검색
-    if not existing_like:
-        existing_like = await db[LIKES_COLLECTION].find_one({
+    # target_id는 쓰기 시점에 항상 ObjectId로 저장되므로, 한 번만 정규화해서
+    # 단일 조회로 확인합니다. 존재 여부만 필요하므로 _id만 projection합니다.
+    existing_like = await db[LIKES_COLLECTION].find_one(
+        {
             "session_id": session_id,
-            "target_id": str(target_id),
+            "target_id": _as_oid(target_id),
             "target_type": target_type
-        })
-        print(f"[DEBUG CRUD] 문자열 검색 결과: {existing_like}")
-    
-    # 3. ObjectId로 변환해서 검색
-    if not existing_like:
-        try:
-            oid = ObjectId(str(target_id))
-            existing_like = await db[LIKES_COLLECTION].find_one({
-                "session_id": session_id,
-                "target_id": oid,
-                "target_type": target_type
-            })
-            print(f"[DEBUG CRUD] ObjectId 검색 결과: {existing_like}")
-        except:
-            pass
-    
-    print(f"[DEBUG CRUD] 최종 기존 좋아요 기록: {existing_like}")
-    result = existing_like is not None
-    print(f"[DEBUG CRUD] 중복 체크 결과: {result}")
-    
-    return result
+        },
+        projection={"_id": 1}
+    )
+    return existing_like is not None
+
+
+def _vote_status_pipeline(target_id: ObjectId, session_id: str, target_type: str) -> List[dict]:
+    """대상 문서 한 건에 현재 세션의 좋아요 여부(user_liked)를 붙이는 파이프라인.
+
+    문서 조회와 좋아요 확인을 $lookup으로 합쳐 Mongo 왕복을 1회로 줄입니다.
+    """
+    return [
+        {"$match": {"_id": target_id}},
+        {"$lookup": {
+            "from": LIKES_COLLECTION,
+            "let": {"tid": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$target_id", "$$tid"]},
+                    {"$eq": ["$session_id", session_id]},
+                    {"$eq": ["$target_type", target_type]},
+                ]}}},
+                {"$limit": 1},
+                {"$project": {"_id": 1}},
+            ],
+            "as": "user_like",
+        }},
+        {"$addFields": {"user_liked": {"$gt": [{"$size": "$user_like"}, 0]}}},
+        {"$project": {"user_like": 0}},
+    ]
+
+
+async def get_question_vote_status(
+        db: AsyncDatabase, session_id: str, question_id: models.PyObjectId
+) -> Optional[dict]:
+    """대표 질문과 해당 세션의 좋아요 여부를 한 번의 쿼리로 조회합니다.
+
+    질문이 없으면 None, 있으면 질문 문서에 user_liked(bool)가 더해진 dict를
+    반환합니다.
+    """
+    pipeline = _vote_status_pipeline(_as_oid(question_id), session_id, "question")
+    cursor = await db[REPRESENTATIVE_QUESTIONS_COLLECTION].aggregate(pipeline)
+    results = await cursor.to_list(length=1)
+    return results[0] if results else None
 
 
-async def create_like(db: AsyncIOMotorDatabase, like_data: models.LikeCreate) -> models.LikeInDB:
+async def get_answer_vote_status(
+        db: AsyncDatabase, session_id: str, answer_id: models.PyObjectId
+) -> Optional[dict]:
+    """답변과 해당 세션의 좋아요 여부를 한 번의 쿼리로 조회합니다."""
+    pipeline = _vote_status_pipeline(_as_oid(answer_id), session_id, "answer")
+    cursor = await db[ANSWERS_COLLECTION].aggregate(pipeline)
+    results = await cursor.to_list(length=1)
+    return results[0] if results else None
+
+
+async def create_like(db: AsyncDatabase, like_data: models.LikeCreate) -> models.LikeInDB:
     """좋아요 기록을 생성합니다."""
     like_dict = like_data.model_dump()
-    print(f"[DEBUG CRUD] 좋아요 저장할 데이터: {like_dict}")
-    
+
     # target_id를 명확한 ObjectId로 변환해서 저장
-    from bson import ObjectId
     if 'target_id' in like_dict:
         try:
-            like_dict['target_id'] = ObjectId(str(like_dict['target_id']))
-            print(f"[DEBUG CRUD] ObjectId로 변환된 target_id: {like_dict['target_id']}")
-        except:
-            print(f"[DEBUG CRUD] ObjectId 변환 실패, 원래 값 사용: {like_dict['target_id']}")
-    
+            like_dict['target_id'] = _as_oid(like_dict['target_id'])
+        except Exception:
+            logger.warning("ObjectId 변환 실패, 원래 값 사용: %s", like_dict['target_id'])
+
     result = await db[LIKES_COLLECTION].insert_one(like_dict)
-    print(f"[DEBUG CRUD] 저장 결과 ID: {result.inserted_id}")
-    
-    created_like = await db[LIKES_COLLECTION].find_one({"_id": result.inserted_id})
-    print(f"[DEBUG CRUD] 저장된 좋아요 기록: {created_like}")
-    
-    return models.LikeInDB(**created_like)
+
+    # 재조회 없이 inserted_id만 채워서 반환합니다. (DB 왕복 1회 절약)
+    like_dict["_id"] = result.inserted_id
+    return models.LikeInDB(**like_dict)
 
 
-async def remove_like(db: AsyncIOMotorDatabase, session_id: str, target_id: models.PyObjectId, target_type: str) -> bool:
+async def remove_like(db: AsyncDatabase, session_id: str, target_id: models.PyObjectId, target_type: str) -> bool:
     """좋아요 기록을 삭제합니다."""
-    print(f"[DEBUG CRUD] 좋아요 삭제 - session_id: {session_id}, target_id: {target_id}, target_type: {target_type}")
-    
-    from bson import ObjectId
-    
-    # 1. 원래 값으로 삭제 시도
+    # 쓰기 시점 타입이 ObjectId로 통일되었으므로 단일 삭제로 충분합니다.
     result = await db[LIKES_COLLECTION].delete_one({
         "session_id": session_id,
-        "target_id": target_id,
+        "target_id": _as_oid(target_id),
         "target_type": target_type
     })
-    
-    # 2. 문자열로 변환해서 삭제 시도
-    if result.deleted_count == 0:
-        result = await db[LIKES_COLLECTION].delete_one({
-            "session_id": session_id,
-            "target_id": str(target_id),
-            "target_type": target_type
-        })
-        print(f"[DEBUG CRUD] 문자열 삭제 결과: {result.deleted_count}")
-    
-    # 3. ObjectId로 변환해서 삭제 시도
-    if result.deleted_count == 0:
-        try:
-            oid = ObjectId(str(target_id))
-            result = await db[LIKES_COLLECTION].delete_one({
-                "session_id": session_id,
-                "target_id": oid,
-                "target_type": target_type
-            })
-            print(f"[DEBUG CRUD] ObjectId 삭제 결과: {result.deleted_count}")
-        except:
-            pass
-    
-    print(f"[DEBUG CRUD] 최종 삭제된 개수: {result.deleted_count}")
     return result.deleted_count > 0
 
 
-async def safe_increment_votes_with_like_check(db: AsyncIOMotorDatabase, session_id: str, question_id: models.PyObjectId, ip_address: str) -> Optional[models.RepresentativeQuestionInDB]:
-    """중복 좋아요를 체크하고 안전하게 좋아요 수를 증가시킵니다."""
-    # 이미 좋아요를 눌렀는지 확인
-    if await check_user_already_liked(db, session_id, question_id, "question"):
+async def safe_increment_votes_with_like_check(db: AsyncDatabase, session_id: str, question_id: models.PyObjectId, ip_address: str) -> Optional[models.RepresentativeQuestionInDB]:
+    """중복 좋아요를 체크하고 안전하게 좋아요 수를 증가시킵니다.
+
+    사전 조회 대신 바로 insert를 시도하고, 유니크 인덱스 위반(DuplicateKeyError)을
+    '이미 좋아요를 누른 경우'로 해석합니다. 확인과 기록이 DB에서 원자적으로
+    처리되므로 왕복이 줄고 동시 요청이 겹쳐도 중복 집계가 발생하지 않습니다.
+    """
+    like_dict = {
+        "session_id": session_id,
+        "target_id": _as_oid(question_id),
+        "target_type": "question",
+        "ip_address": ip_address,
+        "liked_at": datetime.now(timezone.utc),
+    }
+
+    try:
+        result = await db[LIKES_COLLECTION].insert_one(like_dict)
+    except DuplicateKeyError:
         return None  # 이미 좋아요를 누른 경우
-    
-    # 좋아요 기록 생성
-    like_data = models.LikeCreate(
-        session_id=session_id,
-        target_id=question_id,
-        target_type="question",
-        ip_address=ip_address
-    )
-    await create_like(db, like_data)
-    
+
     # 좋아요 수 증가
-    return await increment_representative_question_votes(db, question_id)
+    updated = await increment_representative_question_votes(db, question_id)
+    if updated is None:
+        # 대상 질문이 없으면 방금 넣은 좋아요 기록을 되돌립니다.
+        await db[LIKES_COLLECTION].delete_one({"_id": result.inserted_id})
+    return updated
 
 
-async def safe_decrement_votes_with_like_check(db: AsyncIOMotorDatabase, session_id: str, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
+async def safe_decrement_votes_with_like_check(db: AsyncDatabase, session_id: str, question_id: models.PyObjectId) -> Optional[models.RepresentativeQuestionInDB]:
     """좋아요 기록을 확인하고 안전하게 좋아요 수를 감소시킵니다."""
     # 좋아요를 누른 기록이 있는지 확인
     if not await check_user_already_liked(db, session_id, question_id, "question"):
@@ -604,7 +717,7 @@ async def safe_decrement_votes_with_like_check(db: AsyncIOMotorDatabase, session
 
 
 # --- Answer 좋아요 관련 함수들 ---
-async def get_answer_by_id(db: AsyncIOMotorDatabase, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
+async def get_answer_by_id(db: AsyncDatabase, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
     """ID로 특정 답변 하나를 조회합니다."""
     answer = await db[ANSWERS_COLLECTION].find_one({"_id": answer_id})
     if answer:
@@ -612,47 +725,59 @@ async def get_answer_by_id(db: AsyncIOMotorDatabase, answer_id: models.PyObjectI
     return None
 
 
-async def increment_answer_votes(db: AsyncIOMotorDatabase, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
+async def increment_answer_votes(db: AsyncDatabase, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
     """답변의 좋아요 수를 1 증가시킵니다."""
-    result = await db[ANSWERS_COLLECTION].update_one(
+    # find_one_and_update로 증가와 조회를 한 번의 왕복으로 처리합니다.
+    answer = await db[ANSWERS_COLLECTION].find_one_and_update(
         {"_id": answer_id},
-        {"$inc": {"total_votes": 1}}
+        {"$inc": {"total_votes": 1}},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.modified_count > 0:
-        return await get_answer_by_id(db, answer_id)
+
+    if answer:
+        return models.AnswerInDB(**answer)
     return None
 
 
-async def decrement_answer_votes(db: AsyncIOMotorDatabase, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
+async def decrement_answer_votes(db: AsyncDatabase, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
     """답변의 좋아요 수를 1 감소시킵니다. (최소값은 0)"""
-    result = await db[ANSWERS_COLLECTION].update_one(
+    answer = await db[ANSWERS_COLLECTION].find_one_and_update(
         {"_id": answer_id, "total_votes": {"$gt": 0}},
-        {"$inc": {"total_votes": -1}}
+        {"$inc": {"total_votes": -1}},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.modified_count > 0:
-        return await get_answer_by_id(db, answer_id)
+
+    if answer:
+        return models.AnswerInDB(**answer)
     return None
 
 
-async def safe_increment_answer_votes_with_like_check(db: AsyncIOMotorDatabase, session_id: str, answer_id: models.PyObjectId, ip_address: str) -> Optional[models.AnswerInDB]:
-    """중복 좋아요를 체크하고 안전하게 답변 좋아요 수를 증가시킵니다."""
-    if await check_user_already_liked(db, session_id, answer_id, "answer"):
+async def safe_increment_answer_votes_with_like_check(db: AsyncDatabase, session_id: str, answer_id: models.PyObjectId, ip_address: str) -> Optional[models.AnswerInDB]:
+    """중복 좋아요를 체크하고 안전하게 답변 좋아요 수를 증가시킵니다.
+
+    질문 좋아요와 동일하게, insert 후 유니크 인덱스 위반을 중복으로 해석합니다.
+    """
+    like_dict = {
+        "session_id": session_id,
+        "target_id": _as_oid(answer_id),
+        "target_type": "answer",
+        "ip_address": ip_address,
+        "liked_at": datetime.now(timezone.utc),
+    }
+
+    try:
+        result = await db[LIKES_COLLECTION].insert_one(like_dict)
+    except DuplicateKeyError:
         return None
-    
-    like_data = models.LikeCreate(
-        session_id=session_id,
-        target_id=answer_id,
-        target_type="answer",
-        ip_address=ip_address
-    )
-    await create_like(db, like_data)
-    
-    return await increment_answer_votes(db, answer_id)
+
+    updated = await increment_answer_votes(db, answer_id)
+    if updated is None:
+        # 대상 답변이 없으면 방금 넣은 좋아요 기록을 되돌립니다.
+        await db[LIKES_COLLECTION].delete_one({"_id": result.inserted_id})
+    return updated
 
 
-async def safe_decrement_answer_votes_with_like_check(db: AsyncIOMotorDatabase, session_id: str, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
+async def safe_decrement_answer_votes_with_like_check(db: AsyncDatabase, session_id: str, answer_id: models.PyObjectId) -> Optional[models.AnswerInDB]:
     """좋아요 기록을 확인하고 안전하게 답변 좋아요 수를 감소시킵니다."""
     if not await check_user_already_liked(db, session_id, answer_id, "answer"):
         return None
@@ -1,6 +1,6 @@
-import motor.motor_asyncio
 import os
 from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, ReadPreference
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -9,8 +9,32 @@ MONGO_DATABASE_URL = os.getenv("MONGO_DATABASE_URL")
 DATABASE_NAME = os.getenv("DATABASE_NAME")
 
 # DB 연결 객체 생성
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_DATABASE_URL)
+# PyMongo의 네이티브 asyncio 클라이언트를 사용합니다. (Motor에서 전환)
+# Motor는 모든 호출을 스레드 풀로 감싸 쿼리마다 컨텍스트 스위치가 생기지만,
+# AsyncMongoClient는 이벤트 루프에서 직접 I/O를 수행합니다.
+# - maxPoolSize/minPoolSize: 트래픽이 몰릴 때 커넥션을 새로 여는 비용을 줄이기 위해
+#   풀 크기를 넉넉히 잡고, 최소 커넥션은 미리 열어 둡니다.
+# - maxIdleTimeMS: 한가할 때 유휴 커넥션을 정리해 서버 자원을 돌려줍니다.
+# - serverSelectionTimeoutMS: DB가 죽었을 때 기본 30초 대신 3초 안에 실패를 반환합니다.
+client = AsyncMongoClient(
+    MONGO_DATABASE_URL,
+    maxPoolSize=100,
+    minPoolSize=10,
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=3000,
+)
 database = client[DATABASE_NAME]
 
+# 목록 조회처럼 강한 일관성이 필요 없는 읽기용 핸들.
+# 레플리카 셋 환경에서는 세컨더리로 읽기를 분산해 프라이머리 부하를 줄이고,
+# 단일 노드(개발용 docker-compose)에서는 그냥 프라이머리로 동작합니다.
+read_database = client.get_database(
+    DATABASE_NAME, read_preference=ReadPreference.SECONDARY_PREFERRED
+)
+
 def get_db():
     return database
+
+def get_read_db():
+    """읽기 전용(목록 조회) 엔드포인트에서 사용하는 DB 핸들을 반환합니다."""
+    return read_database
@@ -1,12 +1,12 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from . import crud, database
 from .routers import community, questions, answers, likes
 from .tasks import ai_pipeline
 
-from fastapi.middleware.cors import CORSMiddleware
-
 # --------------------------------------------------------------------------
 # FastAPI 수명 주기(Lifecycle) 이벤트 핸들러
 # --------------------------------------------------------------------------
@@ -27,8 +27,23 @@ async def lifespan(app: FastAPI):
     print("AI 파이프라인 스케줄러를 1분 간격으로 실행합니다.")
     print("=" * 50)
 
+    # 클라이언트는 커넥션을 지연 생성하므로, 시작 시 ping을 한 번 보내
+    # 풀(minPoolSize만큼)을 미리 데워 둡니다. 이렇게 하면 첫 요청이
+    # TCP + 핸드셰이크 비용을 떠안는 '첫 요청 절벽'이 사라지고,
+    # DB가 죽어 있으면 요청을 받기 전에 바로 알 수 있습니다.
+    await database.get_db().command("ping")
+
+    # 쿼리 형태에 맞는 인덱스가 준비되어 있는지 확인합니다. (없을 때만 생성됨)
+    await crud.ensure_indexes(database.get_db())
+
     # 1분(minutes=1)마다 ai_pipeline.run_question_processing_pipeline 함수를 실행하도록 작업을 추가합니다.
-    scheduler.add_job(ai_pipeline.run_question_processing_pipeline, 'interval', minutes=1)
+    # - max_instances=1: 한 틱이 1분을 넘겨도 파이프라인이 겹쳐 돌지 않게 합니다.
+    # - coalesce=True: 밀린 실행이 여러 개 쌓였으면 한 번만 실행합니다.
+    # - misfire_grace_time=30: 30초 이상 늦은 실행은 건너뜁니다. (다음 틱이 곧 오므로)
+    scheduler.add_job(
+        ai_pipeline.run_question_processing_pipeline, 'interval', minutes=1,
+        max_instances=1, coalesce=True, misfire_grace_time=30,
+    )
 
     # 스케줄러를 시작합니다.
     scheduler.start()
@@ -51,7 +66,9 @@ async def lifespan(app: FastAPI):
 # --------------------------------------------------------------------------
 
 # FastAPI 앱 객체를 생성하면서, 위에서 정의한 lifespan을 등록합니다.
-app = FastAPI(lifespan=lifespan)
+# default_response_class=ORJSONResponse: 응답 JSON 직렬화를 표준 json 모듈 대신
+# orjson(C 구현)으로 처리합니다. 목록 API처럼 응답이 큰 경우 직렬화 시간이 크게 줄어듭니다.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # --- CORS 미들웨어 설정 ---
 # 허용할 출처(origin) 목록. 로컬 프론트엔드 개발 서버 주소를 넣습니다.
@@ -67,12 +84,15 @@ origins = [
     # "https://qnahub.xyz",
 ]
 
+# 실제로 쓰는 메소드/헤더만 명시합니다. 와일드카드("*")는 요청마다
+# 허용 목록을 다시 계산하게 만들지만, 명시 목록은 미들웨어 초기화 때
+# 한 번만 문자열로 합쳐져 재사용됩니다.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"], # 모든 HTTP 메소드 허용
-    allow_headers=["*"], # 모든 HTTP 헤더 허용
+    allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # --- 라우터 등록 (prefix="/api" 추가) ---
@@ -84,7 +104,12 @@ app.include_router(likes.router, prefix="/api")
 
 
 # 3. 루트 경로("/")에 대한 기본 API를 정의합니다.
+# 응답 내용이 고정이므로 바이트까지 미리 직렬화해 두고 같은 Response 객체를 재사용합니다.
+# 로드밸런서 헬스체크처럼 호출 빈도가 높은 경로에서 직렬화 비용이 0이 됩니다.
+_ROOT_RESPONSE = ORJSONResponse({"message": "Welcome to QnAHub API"})
+
+
 @app.get("/")
-def read_root():
+async def read_root():
     """서버가 정상적으로 작동하는지 확인하는 기본 엔드포인트입니다."""
-    return {"message": "Welcome to QnAHub API"}
\ No newline at end of file
+    return _ROOT_RESPONSE
\ No newline at end of file
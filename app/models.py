@@ -5,12 +5,23 @@ from bson import ObjectId
 from datetime import datetime, timezone
 from enum import Enum
 
+# 생성 시각 default_factory로 쓰는 공용 헬퍼입니다.
+# 모델마다 람다를 따로 만들지 않고 하나의 함수를 재사용하며,
+# timezone.utc 전역 조회 비용도 기본 인자 바인딩으로 없앱니다.
+def _utcnow(_utc=timezone.utc) -> datetime:
+    return datetime.now(_utc)
+
 
 # --------------------------------------------------------------------------
 # ObjectId를 Pydantic v2에서 완벽하게 처리하기 위한 커스텀 타입 (최종 버전)
 # --------------------------------------------------------------------------
 # 이 클래스 하나로 ObjectId 관련 모든 문제를 해결합니다.
 class PyObjectId(ObjectId):
+    # core schema는 타입이 쓰이는 필드마다 다시 만들 필요가 없으므로,
+    # 한 번 만든 뒤 클래스 레벨에 캐시해 두고 재사용합니다.
+    # (스키마 트리 구성은 pydantic-core에서 가장 비싼 작업 중 하나입니다.)
+    _CORE_SCHEMA: Optional[core_schema.CoreSchema] = None
+
     @classmethod
     def __get_pydantic_core_schema__(
             cls, source_type: Any, handler: Any
@@ -21,17 +32,15 @@ class PyObjectId(ObjectId):
         2. JSON 스키마: 이 타입을 'string' 형식(format: objectid)으로 문서화하도록 합니다.
         3. 직렬화(Serialization): Python 객체를 JSON으로 변환할 때, ObjectId를 str으로 바꿉니다.
         """
+        if cls._CORE_SCHEMA is not None:
+            return cls._CORE_SCHEMA
 
         def validate(v: Any) -> ObjectId:
             if not ObjectId.is_valid(v):
                 raise ValueError("Invalid ObjectId")
             return ObjectId(v)
 
-        # ObjectId -> str 변환 로직
-        def to_str(v: ObjectId) -> str:
-            return str(v)
-
-        return core_schema.json_or_python_schema(
+        cls._CORE_SCHEMA = core_schema.json_or_python_schema(
             json_schema=core_schema.str_schema(
                 min_length=24, max_length=24, pattern="^[0-9a-fA-F]{24}$"
             ),
@@ -42,8 +51,15 @@ class PyObjectId(ObjectId):
                         [core_schema.str_schema(), core_schema.no_info_plain_validator_function(validate)])
                 ]
             ),
-            serialization=core_schema.plain_serializer_function_ser_schema(to_str)
+            # when_used='json': JSON 응답을 만들 때만 str으로 바꿉니다.
+            # model_dump() 같은 Python 모드 덤프에서는 ObjectId를 그대로 유지하므로,
+            # 덤프 결과를 DB에 쓸 때 ID가 문자열로 저장되는 사고를 원천 차단합니다.
+            # return_schema를 선언하면 pydantic-core가 결과를 재검증하지 않습니다.
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                str, return_schema=core_schema.str_schema(), when_used='json'
+            )
         )
+        return cls._CORE_SCHEMA
 
 
 # --------------------------------------------------------------------------
@@ -100,8 +116,11 @@ class RawQuestionBase(BaseModel):
     content: str
     author_id: str
     status: RawQuestionStatus = RawQuestionStatus.PENDING
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
     force_submitted: Optional[bool] = None
+    # content의 SHA1 해시. 동일 내용 재제출을 AI 호출 없이 걸러내는 데 씁니다.
+    # crud에서 저장 시 채워 주므로 클라이언트가 보낼 필요는 없습니다.
+    content_hash: Optional[str] = None
 
 
 class RawQuestionCreate(RawQuestionBase):
@@ -123,7 +142,7 @@ class RepresentativeQuestionBase(BaseModel):
     title: str
     total_votes: int = 0
     status: str = "unanswered"
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
 
 
 class RepresentativeQuestionInDB(RepresentativeQuestionBase):
@@ -157,7 +176,7 @@ class AnswerCreate(AnswerBase):
 
 class AnswerInDB(AnswerBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
 
     class Config:
         from_attributes = True
@@ -198,7 +217,7 @@ class LikeCreate(LikeBase):
 
 class LikeInDB(LikeBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
-    liked_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    liked_at: datetime = Field(default_factory=_utcnow)
 
     class Config:
         from_attributes = True
@@ -1,11 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 from typing import Optional
 from .. import models, crud
 from ..database import get_db
 from pydantic import BaseModel
-import uuid
-import hashlib
+from functools import lru_cache
+import logging
+import secrets
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _parse_oid(value: str) -> models.PyObjectId:
+    """경로 파라미터의 24자리 hex 문자열을 ObjectId로 변환합니다.
+
+    인기 질문에 좋아요가 몰리면 같은 ID가 반복해서 들어오므로,
+    hex 디코딩 결과를 LRU 캐시로 재사용합니다. ObjectId는 불변 객체라
+    핸들러 간에 공유해도 안전합니다. 잘못된 문자열은 캐시되지 않고
+    매번 예외를 던집니다.
+    """
+    return models.PyObjectId(value)
 
 # 좋아요 관련 라우터
 router = APIRouter(
@@ -15,15 +30,21 @@ router = APIRouter(
 
 
 def get_or_create_session_id(request: Request, response: Response) -> str:
-    """쿠키에서 세션 ID를 가져오거나 새로 생성합니다."""
+    """쿠키에서 세션 ID를 가져오거나 새로 생성합니다.
+
+    핸들러에서 직접 호출하지 않고 Depends로 주입합니다. FastAPI가 Request/Response를
+    의존성에 넣어 주므로 핸들러 시그니처에서 두 파라미터가 사라지고,
+    의존성 캐시 덕분에 한 요청 안에서는 한 번만 평가됩니다.
+    """
     session_id = request.cookies.get("session_id")
     
     if not session_id:
-        # 새로운 세션 ID 생성 (UUID + IP 해시 조합)
-        ip_address = request.client.host
-        unique_string = f"{uuid.uuid4()}-{ip_address}"
-        session_id = hashlib.md5(unique_string.encode()).hexdigest()
-        
+        # 새로운 세션 ID 생성 (128비트 난수를 32자리 16진수로)
+        # UUID+IP를 MD5로 해시하던 기존 방식과 형식/엔트로피는 같고,
+        # uuid/hashlib/문자열 조합 단계가 모두 사라집니다.
+        session_id = secrets.token_hex(16)
+
+
         # 쿠키에 세션 ID 설정 (30일 유효)
         response.set_cookie(
             key="session_id", 
@@ -65,54 +86,41 @@ class AnswerVoteStatusResponse(BaseModel):
 async def like_representative_question(
     question_id: str,
     request: Request,
-    response: Response,
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    session_id: str = Depends(get_or_create_session_id),
+    db: AsyncDatabase = Depends(get_db)
 ) -> LikeResponse:
     """
     대표 질문에 좋아요를 누르는 API (쿠키/세션 기반 중복 방지)
     """
-    print(f"[DEBUG] 좋아요 요청 - question_id: {question_id}")
-    print(f"[DEBUG] 클라이언트 IP: {request.client.host}")
-    print(f"[DEBUG] 현재 쿠키: {request.cookies}")
-    
     try:
         # 문자열 ID를 PyObjectId로 변환
-        obj_id = models.PyObjectId(question_id)
+        obj_id = _parse_oid(question_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 question_id입니다."
         )
     
-    # 세션 ID 가져오기 또는 생성
-    session_id = get_or_create_session_id(request, response)
     ip_address = request.client.host
-    
-    print(f"[DEBUG] 세션 ID: {session_id}")
-    print(f"[DEBUG] IP 주소: {ip_address}")
-    
-    # 먼저 해당 질문이 존재하는지 확인
-    existing_question = await crud.get_representative_question_by_id(db, obj_id)
-    if not existing_question:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="해당 ID의 대표 질문을 찾을 수 없습니다."
-        )
-    
-    # 중복 좋아요 체크하고 안전하게 좋아요 수 증가
-    print(f"[DEBUG] 중복 체크 시작 - session_id: {session_id}, obj_id: {obj_id}")
+
+    # 곧바로 좋아요 기록+카운트 증가를 시도합니다. (성공 경로는 왕복 2회)
+    # 존재 확인 조회는 실패했을 때만 수행해 404/400을 구분합니다.
     updated_question = await crud.safe_increment_votes_with_like_check(
         db, session_id, obj_id, ip_address
     )
-    
-    print(f"[DEBUG] 중복 체크 결과: {updated_question is not None}")
-    
+    logger.debug("좋아요 처리 결과 - question_id: %s, 성공: %s", question_id, updated_question is not None)
+
     if not updated_question:
+        if not await crud.get_representative_question_by_id(db, obj_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="해당 ID의 대표 질문을 찾을 수 없습니다."
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 좋아요를 누르셨습니다."
         )
-    
+
     return LikeResponse(
         question_id=updated_question.id,
         total_votes=updated_question.total_votes,
@@ -124,44 +132,38 @@ async def like_representative_question(
 @router.put("/questions/{question_id}/unlike")
 async def unlike_representative_question(
     question_id: str,
-    request: Request,
-    response: Response,
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    session_id: str = Depends(get_or_create_session_id),
+    db: AsyncDatabase = Depends(get_db)
 ) -> LikeResponse:
     """
     대표 질문의 좋아요를 취소하는 API (쿠키/세션 기반)
     """
     try:
         # 문자열 ID를 PyObjectId로 변환
-        obj_id = models.PyObjectId(question_id)
+        obj_id = _parse_oid(question_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 question_id입니다."
         )
     
-    # 세션 ID 가져오기
-    session_id = get_or_create_session_id(request, response)
-    
-    # 먼저 해당 질문이 존재하는지 확인
-    existing_question = await crud.get_representative_question_by_id(db, obj_id)
-    if not existing_question:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="해당 ID의 대표 질문을 찾을 수 없습니다."
-        )
-    
-    # 좋아요 기록 확인 후 안전하게 좋아요 수 감소
+    # 좋아요 기록 확인 후 안전하게 좋아요 수 감소.
+    # 존재 확인 조회는 실패했을 때만 수행해 404/400을 구분합니다.
     updated_question = await crud.safe_decrement_votes_with_like_check(
         db, session_id, obj_id
     )
-    
+
     if not updated_question:
+        if not await crud.get_representative_question_by_id(db, obj_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="해당 ID의 대표 질문을 찾을 수 없습니다."
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="좋아요를 누르지 않았거나 이미 취소되었습니다."
         )
-    
+
     return LikeResponse(
         question_id=updated_question.id,
         total_votes=updated_question.total_votes,
@@ -173,45 +175,34 @@ async def unlike_representative_question(
 @router.get("/questions/{question_id}/votes")
 async def get_representative_question_votes(
     question_id: str,
-    request: Request,
-    response: Response,
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    session_id: str = Depends(get_or_create_session_id),
+    db: AsyncDatabase = Depends(get_db)
 ) -> VoteStatusResponse:
     """
     대표 질문의 좋아요 수를 조회하는 API (사용자의 좋아요 상태 포함)
     """
     try:
         # 문자열 ID를 PyObjectId로 변환
-        obj_id = models.PyObjectId(question_id)
+        obj_id = _parse_oid(question_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 question_id입니다."
         )
     
-    # 해당 질문 조회
-    question = await crud.get_representative_question_by_id(db, obj_id)
-    if not question:
+    # 질문 조회와 좋아요 여부 확인을 $lookup 한 번으로 합쳐 조회합니다.
+    vote_status = await crud.get_question_vote_status(db, session_id, obj_id)
+    if not vote_status:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="해당 ID의 대표 질문을 찾을 수 없습니다."
         )
-    
-    # 세션 ID 가져오기
-    session_id = get_or_create_session_id(request, response)
-    
-    # 사용자가 좋아요를 눌렀는지 확인
-    try:
-        user_liked = await crud.check_user_already_liked(db, session_id, obj_id, "question")
-    except Exception as e:
-        # 에러가 나면 False로 기본값 설정
-        user_liked = False
-    
+
     return VoteStatusResponse(
-        question_id=str(question.id),
-        total_votes=question.total_votes,
-        question_content=question.title,
-        user_liked=user_liked
+        question_id=str(vote_status["_id"]),
+        total_votes=vote_status["total_votes"],
+        question_content=vote_status["title"],
+        user_liked=vote_status["user_liked"]
     )
 
 
@@ -220,42 +211,39 @@ async def get_representative_question_votes(
 async def like_answer(
     answer_id: str,
     request: Request,
-    response: Response,
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    session_id: str = Depends(get_or_create_session_id),
+    db: AsyncDatabase = Depends(get_db)
 ) -> LikeResponse:
     """
     답변에 좋아요를 누르는 API (쿠키/세션 기반 중복 방지)
     """
     try:
-        obj_id = models.PyObjectId(answer_id)
+        obj_id = _parse_oid(answer_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 answer_id입니다."
         )
     
-    session_id = get_or_create_session_id(request, response)
     ip_address = request.client.host
-    
-    # 답변 존재 확인
-    existing_answer = await crud.get_answer_by_id(db, obj_id)
-    if not existing_answer:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="해당 ID의 답변을 찾을 수 없습니다."
-        )
-    
-    # 중복 좋아요 체크 후 좋아요 수 증가
+
+    # 곧바로 좋아요 기록+카운트 증가를 시도하고,
+    # 실패했을 때만 존재 확인 조회로 404/400을 구분합니다.
     updated_answer = await crud.safe_increment_answer_votes_with_like_check(
         db, session_id, obj_id, ip_address
     )
-    
+
     if not updated_answer:
+        if not await crud.get_answer_by_id(db, obj_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="해당 ID의 답변을 찾을 수 없습니다."
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 좋아요를 누르셨습니다."
         )
-    
+
     return LikeResponse(
         question_id=updated_answer.id,  # answer_id를 반환
         total_votes=updated_answer.total_votes,
@@ -267,42 +255,37 @@ async def like_answer(
 @router.put("/answers/{answer_id}/unlike")
 async def unlike_answer(
     answer_id: str,
-    request: Request,
-    response: Response,
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    session_id: str = Depends(get_or_create_session_id),
+    db: AsyncDatabase = Depends(get_db)
 ) -> LikeResponse:
     """
     답변의 좋아요를 취소하는 API (쿠키/세션 기반)
     """
     try:
-        obj_id = models.PyObjectId(answer_id)
+        obj_id = _parse_oid(answer_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 answer_id입니다."
         )
     
-    session_id = get_or_create_session_id(request, response)
-    
-    # 답변 존재 확인
-    existing_answer = await crud.get_answer_by_id(db, obj_id)
-    if not existing_answer:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="해당 ID의 답변을 찾을 수 없습니다."
-        )
-    
-    # 좋아요 기록 확인 후 좋아요 수 감소
+    # 좋아요 기록 확인 후 좋아요 수 감소.
+    # 존재 확인 조회는 실패했을 때만 수행해 404/400을 구분합니다.
     updated_answer = await crud.safe_decrement_answer_votes_with_like_check(
         db, session_id, obj_id
     )
-    
+
     if not updated_answer:
+        if not await crud.get_answer_by_id(db, obj_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="해당 ID의 답변을 찾을 수 없습니다."
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="좋아요를 누르지 않았거나 이미 취소되었습니다."
         )
-    
+
     return LikeResponse(
         question_id=updated_answer.id,  # answer_id를 반환
         total_votes=updated_answer.total_votes,
@@ -314,37 +297,32 @@ async def unlike_answer(
 @router.get("/answers/{answer_id}/votes")
 async def get_answer_votes(
     answer_id: str,
-    request: Request,
-    response: Response,
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    session_id: str = Depends(get_or_create_session_id),
+    db: AsyncDatabase = Depends(get_db)
 ) -> AnswerVoteStatusResponse:
     """
     답변의 좋아요 수를 조회하는 API (사용자의 좋아요 상태 포함)
     """
     try:
-        obj_id = models.PyObjectId(answer_id)
+        obj_id = _parse_oid(answer_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="유효하지 않은 answer_id입니다."
         )
     
-    # 답변 조회
-    answer = await crud.get_answer_by_id(db, obj_id)
-    if not answer:
+    # 답변 조회와 좋아요 여부 확인을 $lookup 한 번으로 합쳐 조회합니다.
+    vote_status = await crud.get_answer_vote_status(db, session_id, obj_id)
+    if not vote_status:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="해당 ID의 답변을 찾을 수 없습니다."
         )
-    
-    session_id = get_or_create_session_id(request, response)
-    
-    # 사용자가 좋아요를 눌렀는지 확인
-    user_liked = await crud.check_user_already_liked(db, session_id, obj_id, "answer")
-    
+
+    content = vote_status["content"]
     return AnswerVoteStatusResponse(
-        answer_id=str(answer.id),
-        total_votes=answer.total_votes,
-        answer_content=answer.content[:100] + "..." if len(answer.content) > 100 else answer.content,
-        user_liked=user_liked
+        answer_id=str(vote_status["_id"]),
+        total_votes=vote_status["total_votes"],
+        answer_content=content[:100] + "..." if len(content) > 100 else content,
+        user_liked=vote_status["user_liked"]
     )
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel
 from enum import Enum
 from .. import crud, models, database
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from ..utils import ai_validator, ai_similarity_checker
+from pymongo.asynchronous.database import AsyncDatabase
+from ..utils import ai_validator
 
 # --- 라우터 설정 ---
 router = APIRouter(
@@ -34,37 +34,65 @@ class SubmitQuestionResponse(BaseModel):
              summary="사용자 질문 예비 검토 및 옵션 제공")
 async def submit_or_check_raw_question(
         question_data: models.RawQuestionCreate,
+        background_tasks: BackgroundTasks,
         # 'force' 쿼리 파라미터를 추가하여 사용자가 강제 등록을 원할 때를 처리합니다.
         force: bool = Query(False, description="유사 질문 경고를 무시하고 강제로 새 질문을 등록합니다."),
-        db: AsyncIOMotorDatabase = Depends(database.get_db)
+        db: AsyncDatabase = Depends(database.get_db)
 ):
     """
     사용자의 질문을 제출받아 유효성을 검사하고, 유사 질문을 찾습니다.
     - 유사 질문이 없거나 `force=true`이면, 새 질문을 등록합니다.
     - 유사 질문이 있으면, 사용자에게 선택지를 제공합니다.
     """
-    # --- 1. AI 유효성 검사 ---
-    is_valid, reason = await ai_validator.validate_question_content(question_data.content)
+    # --- 0. 동일 내용 재제출이면 AI를 부르지 않고 인덱스 조회 한 번으로 처리 ---
+    # (같은 질문을 그대로 다시 붙여넣는 경우가 잦아, 해시 비교로 먼저 거릅니다.
+    #  force=true는 의도적 재등록이므로 건너뛰고, rejected였던 내용은 재검토 기회를 줍니다.)
+    if not force:
+        content_hash = crud.raw_question_content_hash(question_data.content)
+        duplicate = await crud.get_raw_question_by_content_hash(db, content_hash)
+        if duplicate and duplicate.status != models.RawQuestionStatus.REJECTED:
+            # 이미 대표 질문으로 종합됐다면 그 대표 질문을 유사 질문으로 안내합니다.
+            representative = await crud.get_representative_question_for_raw(db, duplicate.id)
+            if representative:
+                return SubmitQuestionResponse(
+                    status=QuestionSubmissionStatus.SIMILAR_QUESTION_FOUND,
+                    message="동일한 내용의 질문이 이미 대표 질문으로 등록되어 있습니다. 기존 질문에 공감해주세요.",
+                    similar_question=models.RepresentativeQuestion.model_validate(representative)
+                )
+            # 아직 처리 대기 중이면 기존 접수 건을 그대로 돌려줍니다.
+            return SubmitQuestionResponse(
+                status=QuestionSubmissionStatus.NEW_QUESTION_SUBMITTED,
+                message="동일한 내용의 질문이 이미 접수되어 처리 대기 중입니다.",
+                submitted_question=duplicate
+            )
+
+    # --- 1. AI 유효성 검사 + 유사 질문 검색 (Gemini 호출 1회로 통합) ---
+    # force=true면 유사 질문 목록을 비워 보내 유효성 검사만 수행합니다.
+    existing_questions = [] if force else await crud.get_all_rep_questions_for_similarity_check(db, limit=100)
+
+    is_valid, reason, similar_id = await ai_validator.validate_and_find_similar(
+        content=question_data.content,
+        existing_questions=existing_questions,
+    )
     if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"유효하지 않은 질문입니다. 이유: {reason}"
         )
 
-    # --- 2. 'force' 옵션이 없는 경우에만 유사 질문 검색 ---
-    if not force:
-        similar_question = await ai_similarity_checker.find_most_similar_question(
-            new_question_content=question_data.content,
-            db=db
+    # --- 2. AI가 유사 질문 id를 골랐다면, 전체 문서를 '한 번만' 조회해 반환 ---
+    # (후보 목록은 _id/title만 담은 경량 projection이므로 응답용으로는 재조회가 필요합니다.)
+    if similar_id and any(str(q.id) == similar_id for q in existing_questions):
+        similar_question = await crud.get_representative_question_by_id(
+            db, models.PyObjectId(similar_id)
         )
-
-        # 유사 질문을 찾았다면, DB에 저장하지 않고 선택지를 반환
         if similar_question:
             return SubmitQuestionResponse(
                 status=QuestionSubmissionStatus.SIMILAR_QUESTION_FOUND,
                 message="매우 유사한 질문이 이미 존재합니다. 기존 질문에 공감하시거나, 새로운 질문으로 등록해주세요.",
-                similar_question=similar_question
+                similar_question=models.RepresentativeQuestion.model_validate(similar_question)
             )
+        # AI가 목록에 없는 id를 반환한 경우(환각)는 유사 질문 없음으로 처리합니다.
 
     # --- 3. 유사 질문이 없거나, 사용자가 강제 등록을 원할 경우 ---
 
@@ -73,15 +101,20 @@ async def submit_or_check_raw_question(
     final_question_data = models.RawQuestionCreate(
         content=question_data.content,
         author_id=question_data.author_id,
-        force_submitted=force  # <- 바로 이 부분!
+        force_submitted=force,  # <- 바로 이 부분!
+        content_hash=crud.raw_question_content_hash(question_data.content)
     )
 
-    created_question = await crud.create_raw_question(db=db, question_data=final_question_data)
+    # 삽입은 사용자를 기다리게 할 필요가 없으므로 응답 전송 후에 수행합니다.
+    # _id를 미리 발급해 응답에 실어 주면, 백그라운드 삽입 결과와 일치합니다.
+    # (AI 파이프라인은 1분 주기이므로 몇 ms 늦게 들어가도 무방합니다.)
+    pending_question = models.RawQuestionInDB(**final_question_data.model_dump())
+    background_tasks.add_task(crud.insert_prepared_raw_question, db, pending_question)
 
     return SubmitQuestionResponse(
         status=QuestionSubmissionStatus.NEW_QUESTION_SUBMITTED,
         message="새로운 질문으로 정상 접수되었습니다.",
-        submitted_question=created_question
+        submitted_question=pending_question
     )
 
 
@@ -94,12 +127,17 @@ async def submit_or_check_raw_question(
 async def get_representative_questions(
         skip: int = 0,
         limit: int = 10,
-        db: AsyncIOMotorDatabase = Depends(database.get_db)
+        after_votes: Optional[int] = Query(None, description="직전 페이지 마지막 질문의 공감 수 (커서 페이지네이션)"),
+        after_id: Optional[str] = Query(None, description="직전 페이지 마지막 질문의 ID (커서 페이지네이션)"),
+        db: AsyncDatabase = Depends(database.get_read_db)
 ):
     """
     AI에 의해 생성된 '대표 질문' 목록을 조회합니다.
     '뜨고 있는 질문' UI에 사용됩니다.
     - **skip**: 건너뛸 질문 수
     - **limit**: 가져올 최대 질문 수
+    - **after_votes**/**after_id** (선택적): 직전 페이지 마지막 질문의 커서 값
     """
-    return await crud.get_all_representative_questions(db=db, skip=skip, limit=limit)
\ No newline at end of file
+    return await crud.get_all_representative_questions(
+        db=db, skip=skip, limit=limit, after_votes=after_votes, after_id=after_id
+    )
\ No newline at end of file
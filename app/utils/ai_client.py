@@ -1,6 +1,9 @@
+import logging
 import os
 import google.generativeai as genai
 
+logger = logging.getLogger(__name__)
+
 
 class GeminiClient:
     """
@@ -43,9 +46,11 @@ class GeminiClient:
 
         try:
             response = await model.generate_content_async(prompt)
-            return response.text.strip()
-        except Exception as e:
-            print(f"Error during Gemini text generation: {e}")
+            # strip()은 호출자마다 필요 여부가 다르고 어차피 각자 정리하므로,
+            # 여기서 복사본을 만들지 않고 원문 그대로 돌려줍니다.
+            return response.text
+        except Exception:
+            logger.exception("Gemini 텍스트 생성 중 오류 발생")
             # 에러 발생 시, 빈 문자열이나 특정 에러 메시지를 반환할 수 있습니다.
             return ""
 
@@ -1,47 +1,99 @@
+import json
+import logging
+import re
 from .ai_client import gemini_client
-from typing import Tuple
+from typing import List, Optional, Tuple
 
+logger = logging.getLogger(__name__)
 
+# 글자(한글/영문 등)가 하나도 없는 입력(숫자/기호/공백뿐)을 걸러내는 패턴입니다.
+_NON_TEXT = re.compile(r"^[\W\d_]+$")
 
-
-async def validate_question_content(content: str) -> Tuple[bool, str]:
-    """
-    AI를 이용해 질문 내용이 유효한지 검사합니다.
-    반환값: (True/False, "이유")
-    """
-    prompt = f"""
+# 프롬프트 템플릿. 요청마다 ~500자 f-string을 다시 조립하는 대신 모듈 로드 시
+# 한 번만 만들어 두고 content 치환만 수행합니다. (JSON 리터럴의 중괄호는
+# str.format을 위해 {{ }}로 이스케이프되어 있습니다.)
+_VALIDATE_AND_SIMILAR_PROMPT = """
         당신은 QnAHub 커뮤니티의 엄격한 관리자입니다.
-        사용자가 제출한 다음 질문이 커뮤니티에 등록될 만한 가치가 있는지 판단해주세요.
+        사용자가 제출한 '새로운 질문'에 대해 아래 두 가지를 한 번에 판단해주세요.
 
-        **[판단 기준]**
+        **[판단 1: 유효성]**
         아래 중 하나라도 해당되면 '부적합'입니다:
         - 단순한 감정 표현 (예: "좋아요", "심심하다")
         - 커뮤니티와 관련 없는 개인적인 잡담 (예: "오늘 저녁 뭐 먹죠?")
         - 욕설, 비방, 광고 등 부적절한 내용
         - 의미를 알 수 없는 단어나 문장
 
-        **[사용자 질문]**
+        **[판단 2: 유사 질문]**
+        질문이 적합하다면, '기존 질문 목록' 중 묻고자 하는 핵심 의도가 거의 동일한
+        질문 딱 하나의 id를 골라주세요. 매우 유사한 질문이 없으면 null로 두세요.
+
+        **[새로운 질문]**
         "{content}"
 
-        **[판단 결과]**
-        먼저 '적합' 또는 '부적합'이라고만 대답해주세요.
-        만약 '부적합'이라면, 그 이유를 한 문장으로 간결하게 설명해주세요.
-        (예: 부적합. 단순한 감정 표현입니다.)
+        **[기존 질문 목록]**
+        {existing_questions_text}
+
+        **[결과 형식 - 반드시 아래 JSON만 반환]**
+        {{"valid": true 또는 false, "reason": "부적합일 때만 한 문장 이유", "similar_id": "가장 유사한 질문 id 또는 null"}}
+    """
+
+
+def _local_reject_reason(content: str) -> Optional[str]:
+    """LLM을 부를 필요도 없이 거를 수 있는 질문이면 이유를 반환합니다.
+
+    명백한 스팸/빈 입력에 ~수백 ms짜리 Gemini 호출을 쓰지 않기 위한
+    마이크로초 단위의 사전 필터입니다. 통과하면 None을 반환합니다.
+    """
+    stripped = content.strip()
+    if len(stripped) < 5:
+        return "질문이 너무 짧습니다."
+    if _NON_TEXT.match(stripped):
+        return "의미를 알 수 없는 단어나 문장입니다."
+    return None
+
+
+async def validate_and_find_similar(
+        content: str,
+        existing_questions: List,
+) -> Tuple[bool, str, Optional[str]]:
+    """
+    질문 유효성 검사와 유사 질문 탐색을 Gemini 호출 '한 번'으로 처리합니다.
+
+    기존에는 validate_question_content와 find_most_similar_question이 각각
+    LLM을 호출해 제출 한 건당 왕복이 두 번이었는데, 두 판단을 하나의
+    프롬프트로 합쳐 왕복을 한 번으로 줄입니다.
+
+    반환값: (유효 여부, 이유, 가장 유사한 기존 질문의 id 문자열 또는 None)
     """
+    local_reason = _local_reject_reason(content)
+    if local_reason:
+        return False, local_reason, None
+
+    existing_questions_text = "\n".join(
+        [f'- (id: "{q.id}") {q.title}' for q in existing_questions]
+    ) or "(기존 질문 없음)"
+
+    prompt = _VALIDATE_AND_SIMILAR_PROMPT.format(
+        content=content, existing_questions_text=existing_questions_text
+    )
     try:
-        result_text = await gemini_client.generate_text(prompt)
-
-        if result_text.startswith("적합"):
-            return True, "적합한 질문입니다."
-        elif result_text.startswith("부적합"):
-            # "부적합." 이후의 이유 부분을 추출합니다.
-            reason = result_text.replace("부적합.", "").strip()
-            return False, reason
-        else:
-            # AI가 예상과 다른 답변을 한 경우, 일단 통과시킵니다. (안전장치)
-            return True, "AI 판단 불가"
-
-    except Exception as e:
-        print(f"AI Validator Error: {e}")
+        result_text = await gemini_client.generate_text(prompt, pro_model=True)
+
+        # AI가 ```json ... ``` 마크다운을 붙여 보낼 수 있으므로 제거 후 파싱합니다.
+        cleaned = result_text.strip().replace('```json', '').replace('```', '')
+        result = json.loads(cleaned)
+
+        if not result.get("valid", True):
+            return False, result.get("reason", "부적합한 질문입니다."), None
+        similar_id = result.get("similar_id")
+        if similar_id in (None, "", "null", "None"):
+            similar_id = None
+        return True, "적합한 질문입니다.", similar_id
+
+    except json.JSONDecodeError:
+        # 형식이 깨진 응답은 판단 불가로 보고 일단 통과시킵니다. (안전장치)
+        return True, "AI 판단 불가", None
+    except Exception:
+        logger.exception("AI 검증/유사도 판단 중 오류 발생")
         # AI 시스템에 문제가 생긴 경우, 일단 통과시켜서 서비스 장애를 막습니다.
-        return True, "AI 검증 시스템 오류"
\ No newline at end of file
+        return True, "AI 검증 시스템 오류", None
\ No newline at end of file